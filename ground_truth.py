@@ -19,12 +19,21 @@
 
 import os
 import sys
-import csv
+import math
 import json
+import heapq
+import functools
+from array import array
 import numpy as np 
 from enum import Enum
 from utils_sys import Printer 
 
+kOrjsonAvailable = True
+try:
+    import orjson   # faster json parsing, only used for legacy json associations files
+except:
+    kOrjsonAvailable = False 
+
 
 class GroundTruthType(Enum):
     NONE = 1
@@ -39,6 +48,8 @@ kScaleKitti = 1
 kScaleTum = 1    
 kScaleEuroc = 1  
 
+kLazyLoadingBufferSize = 1000   # number of parsed groundtruth lines kept in memory when using lazy loading 
+
 
 def groundtruth_factory(settings):
 
@@ -53,28 +64,152 @@ def groundtruth_factory(settings):
     if 'start_frame_id' in settings:
         Printer.orange(f'groundtruth_factory - start_frame_id: {settings["start_frame_id"]}')
         start_frame_id = int(settings['start_frame_id'])
+        
+    lazy_loading = False    # if True, the groundtruth lines are read and parsed on demand (for very long trajectories)
+    if 'lazy_loading' in settings:
+        Printer.orange(f'groundtruth_factory - lazy_loading: {settings["lazy_loading"]}')
+        lazy_loading = settings['lazy_loading']
+        if isinstance(lazy_loading, str):
+            lazy_loading = lazy_loading.strip().lower() in ('true', 'yes', 'on', '1')   # e.g. 'False' must not be taken as True 
+        lazy_loading = bool(lazy_loading)
                    
     print('using groundtruth: ', type)   
     if type == 'kitti':         
-        return KittiGroundTruth(path, name, associations, start_frame_id, GroundTruthType.KITTI)
+        return KittiGroundTruth(path, name, associations, start_frame_id, GroundTruthType.KITTI, lazy=lazy_loading)
     if type == 'tum':          
         if 'associations' in settings:
             associations = settings['associations']        
-        return TumGroundTruth(path, name, associations, start_frame_id, GroundTruthType.TUM)
+        return TumGroundTruth(path, name, associations, start_frame_id, GroundTruthType.TUM, lazy=lazy_loading)
     if type == 'euroc':         
-        return EurocGroundTruth(path, name, associations, start_frame_id, GroundTruthType.EUROC)
+        return EurocGroundTruth(path, name, associations, start_frame_id, GroundTruthType.EUROC, lazy=lazy_loading)
     if type == 'video' or type == 'folder':   
         name = settings['groundtruth_file']
-        return SimpleGroundTruth(path, name, associations, start_frame_id, GroundTruthType.SIMPLE)     
+        return SimpleGroundTruth(path, name, associations, start_frame_id, GroundTruthType.SIMPLE, lazy=lazy_loading)     
     else:
         print('not using groundtruth')
         print('if you are using main_vo.py, your estimated trajectory will not make sense!')          
         return GroundTruth(path, name, associations, start_frame_id, type=GroundTruthType.NONE)
 
 
+# return the timestamps of a list of (stamp,data) tuples as an array; 
+# arrays of stamps and arrays whose first column contains the stamps are also accepted 
+def get_timestamps(entries):
+    if isinstance(entries, np.ndarray):
+        return np.asarray(entries if entries.ndim == 1 else entries[:,0], dtype=np.float64)
+    # e[0] extracts the first element which is a timestamp; the conversion to float (also from strings) is done by numpy in a single pass 
+    return np.array([e[0] for e in entries], dtype=np.float64).reshape(-1)
+
+
+# return the next closest candidate (diff, ib) of the first timestamp t not yet proposed, where ib is the index in the unsorted 
+# second timestamps (ib = -1 if no candidate is left); candidates at the same diff (duplicate timestamps or equidistant neighbors) 
+# are proposed in increasing order of ib, as in the sort of the full N*M product: they are collected at once and kept in pending[ia]; 
+# lo[ia] and hi[ia] are the next left and right candidates of t in sorted_second_ts and are advanced accordingly 
+def associate_next_candidate(t, sorted_second_ts, second_order, lo, hi, pending, ia):
+    if ia in pending:
+        diff, ibs = pending[ia]
+        ib = ibs.pop()
+        if not ibs:
+            del pending[ia]
+        return diff, ib
+    num_second = len(sorted_second_ts)
+    diff_lo = t - sorted_second_ts[lo[ia]] if lo[ia] >= 0 else np.inf
+    diff_hi = sorted_second_ts[hi[ia]] - t if hi[ia] < num_second else np.inf
+    diff = min(diff_lo, diff_hi)
+    if diff == np.inf:
+        return np.inf, -1
+    ibs = []
+    while lo[ia] >= 0 and t - sorted_second_ts[lo[ia]] == diff:
+        ibs.append(second_order[lo[ia]])
+        lo[ia] -= 1
+    while hi[ia] < num_second and sorted_second_ts[hi[ia]] - t == diff:
+        ibs.append(second_order[hi[ia]])
+        hi[ia] += 1
+    ibs.sort(reverse=True)
+    ib = ibs.pop()
+    if ibs:
+        pending[ia] = (diff, ibs)
+    return diff, ib
+
+
+# greedy assignment in increasing order of (diff, ia, ib), starting from the first candidates (diffs[i], ias[i], ibs[i]), where ibs[i] = -1 
+# asks associate_next_candidate() for it: when the current candidate of ia has been already taken, ia proposes its next closest one 
+# (within max_difference); this gives the same matches as the greedy assignment over the sorted N*M product 
+# return the arrays ias, ibs, diffs of the matches, where ibs are indices in the unsorted second timestamps
+def associate_greedy(first_ts, sorted_second_ts, second_order, lo, hi, diffs, ias, ibs, max_difference):
+    # the loop runs on plain python lists and bytearray flags: element access and heap comparisons are much faster than on numpy scalars 
+    first_flag = bytearray(len(first_ts))
+    second_flag = bytearray(len(sorted_second_ts))
+    first_ts, sorted_second_ts, second_order = first_ts.tolist(), sorted_second_ts.tolist(), second_order.tolist()
+    lo, hi = lo.tolist(), hi.tolist()
+    pending = {}
+    potential_matches = []
+    for diff, ia, ib in zip(diffs.tolist(), ias.tolist(), ibs.tolist()):
+        if ib < 0:
+            diff, ib = associate_next_candidate(first_ts[ia], sorted_second_ts, second_order, lo, hi, pending, ia)
+        potential_matches.append((diff, ia, ib))
+    heapq.heapify(potential_matches)
+    out_ias = []
+    out_ibs = []
+    out_diffs = []
+    while potential_matches:
+        diff, ia, ib = heapq.heappop(potential_matches)
+        if second_flag[ib]: 
+            diff, ib = associate_next_candidate(first_ts[ia], sorted_second_ts, second_order, lo, hi, pending, ia)
+            if ib >= 0 and diff < max_difference:
+                heapq.heappush(potential_matches, (diff, ia, ib))
+            continue
+        if not first_flag[ia]:
+            first_flag[ia] = 1
+            second_flag[ib] = 1 
+            out_ias.append(ia)
+            out_ibs.append(ib)
+            out_diffs.append(diff)
+    return np.array(out_ias, dtype=np.int64), np.array(out_ibs, dtype=np.int64), np.array(out_diffs, dtype=np.float64)
+
+
+# associate the timestamps first_ts to the timestamps second_ts (shifted by offset): as the time stamps never match exactly, 
+# we greedily take the closest available match (within max_difference) for every first timestamp 
+# return the arrays ias, ibs, diffs of the matches (first_ts[ias[i]] is associated to second_ts[ibs[i]])
+def associate_nearest(first_ts, second_ts, offset=0, max_difference=0.025*(10**9)):
+    first_ts = np.asarray(first_ts, dtype=np.float64)
+    second_ts = np.asarray(second_ts, dtype=np.float64) + offset
+    # sort the second timestamps once: the candidates of each first timestamp are then found by binary search, 
+    # starting from its two nearest neighbors sorted_second_ts[j-1] and sorted_second_ts[j], instead of scanning the full N*M product 
+    second_order = np.argsort(second_ts, kind='stable')
+    sorted_second_ts = second_ts[second_order]
+    num_second = len(sorted_second_ts)
+    num_first = len(first_ts)
+    # first candidates of all the first timestamps at once: the closest of the two neighbors of each insertion point 
+    lo = np.searchsorted(sorted_second_ts, first_ts) - 1   # left neighbor of each first timestamp 
+    hi = lo + 1                                            # right neighbor of each first timestamp
+    if num_second > 0:
+        diff_lo = np.where(lo >= 0, first_ts - sorted_second_ts[np.maximum(lo,0)], np.inf)
+        diff_hi = np.where(hi < num_second, sorted_second_ts[np.minimum(hi,num_second-1)] - first_ts, np.inf)
+        # a neighbor further out at the same diff (duplicate timestamps) 
+        diff_lo2 = np.where(lo >= 1, first_ts - sorted_second_ts[np.maximum(lo-1,0)], np.inf)
+        diff_hi2 = np.where(hi+1 < num_second, sorted_second_ts[np.minimum(hi+1,num_second-1)] - first_ts, np.inf)
+    else: 
+        diff_lo = diff_hi = diff_lo2 = diff_hi2 = np.full(num_first, np.inf)
+    take_lo = diff_lo <= diff_hi
+    first_diffs = np.where(take_lo, diff_lo, diff_hi)
+    first_ibs = second_order[np.where(take_lo, lo, hi)] if num_second > 0 else np.full(num_first, -1)
+    # ties at the first diff have to be broken on the smallest ib: these few first candidates are left to associate_next_candidate()
+    tied = (diff_lo == diff_hi) | np.where(take_lo, diff_lo2 == diff_lo, diff_hi2 == diff_hi)
+    first_ibs = np.where(tied, -1, first_ibs)
+    lo = np.where(take_lo & ~tied, lo-1, lo)   # next left candidate of each first timestamp 
+    hi = np.where(~take_lo & ~tied, hi+1, hi)  # next right candidate of each first timestamp
+    # the scan stops at the search radius: only the first timestamps with a candidate within max_difference are kept 
+    first_ias = np.flatnonzero(first_diffs < max_difference)
+    ias, ibs, diffs = associate_greedy(first_ts, sorted_second_ts, second_order, lo, hi, 
+                                       first_diffs[first_ias], first_ias, first_ibs[first_ias], max_difference)
+    num_missing_associations = num_first - len(ias)
+    if num_missing_associations > 0:
+        Printer.red(f'ERROR: {num_missing_associations} missing associations!')
+    return ias, ibs, diffs
+
 # base class 
 class GroundTruth(object):
-    def __init__(self, path, name, associations=None, start_frame_id=0, type=GroundTruthType.NONE):
+    def __init__(self, path, name, associations=None, start_frame_id=0, type=GroundTruthType.NONE, lazy=False):
         self.path=path 
         self.name=name 
         self.type=type    
@@ -84,124 +219,299 @@ class GroundTruth(object):
         self.data=None 
         self.scale = 1
         self.start_frame_id=start_frame_id
+        self.lazy = lazy 
         
         self.trajectory = None 
         self.timestamps = None
+        self.scales = None
+        self._timestamps_are_sorted = False
+        
+        # groundtruth samples parsed once at loading time (structure of arrays)
+        self._ts = None     # [N] timestamps
+        self._xyz = None    # [Nx3] scaled positions 
+        self._assoc_idx = None  # [num_frames] dense map frame_id -> sample index (-1 if not associated), when the samples are associated to the frames 
+        # the tracker asks for the poses of the frames i-1 and i at consecutive calls: keep the last ones at hand
+        self._getTimePose = functools.lru_cache(maxsize=4)(self._getTimePose)
+        
+        # lazy loading: the groundtruth file is only indexed, its lines are read and parsed on demand 
+        self._line_offsets = None   # [N] byte offset of each sample line in the groundtruth file 
+        self._lazy_filename = None
+        self._lazy_columns = None   # (timestamp column, xyz columns) of the sample lines
+        self._lazy_timestamps = None 
+        self._lazy_skiprows = 0
+        # circular buffer of the last parsed lines 
+        self._readRow = functools.lru_cache(maxsize=kLazyLoadingBufferSize)(self._readRow)
 
+    # parse the groundtruth file into a float array; if cache_file is given, the parsed array is saved there as .npy 
+    # and memory-mapped on the next runs (as long as the groundtruth file keeps the same size and modification time) 
+    def loadData(self, filename, cache_file=None, **loadtxt_kwargs):
+        if cache_file is not None:
+            source_file = os.path.splitext(cache_file)[0] + '_source.npy'   # [size, mtime_ns] of the parsed groundtruth file
+            stat = os.stat(filename)
+            source = np.array([stat.st_size, stat.st_mtime_ns], dtype=np.int64)
+            if os.path.isfile(cache_file) and os.path.isfile(source_file) and np.array_equal(np.load(source_file), source):
+                return np.load(cache_file, mmap_mode='r')
+        data = np.loadtxt(filename, dtype=np.float64, ndmin=2, **loadtxt_kwargs)
+        if cache_file is not None:
+            try:
+                np.save(cache_file, data)
+                np.save(source_file, source)
+            except OSError as e:
+                Printer.orange(f'WARNING: cannot save groundtruth cache {cache_file}: {e}')
+        return data
+
+    # lazy loading: index the byte offsets of the sample lines of filename without parsing them; the timestamps are 
+    # read from the column ts_col or, if ts_col is None, taken from the array timestamps 
+    def openLazy(self, filename, xyz_cols, ts_col=0, timestamps=None, skiprows=0):
+        offsets = array('q')   # 8 bytes per sample line, no list of python ints 
+        offset = 0
+        with open(filename, 'rb') as f:
+            for i, line in enumerate(f):
+                stripped = line.strip()
+                if i >= skiprows and stripped and not stripped.startswith(b'#'):
+                    offsets.append(offset)
+                offset += len(line)
+        self._line_offsets = np.frombuffer(offsets, dtype=np.int64)
+        self._lazy_filename = filename
+        self._lazy_columns = (ts_col, tuple(xyz_cols))
+        self._lazy_timestamps = timestamps
+        self._lazy_skiprows = skiprows
+        
+    # lazy loading: read and parse the sample line idx; the file is opened at each read (no handle is kept open or 
+    # shared across threads), the LRU buffer of the parsed lines avoids most of the reads 
+    def _readRow(self, idx):
+        with open(self._lazy_filename, 'rb') as f:
+            f.seek(int(self._line_offsets[idx]))
+            return [float(v) for v in f.readline().split()]
+    
+    # lazy loading: return timestamp,x,y,z of the sample idx
+    def _readSample(self, idx):
+        row = self._readRow(idx)
+        ts_col, xyz_cols = self._lazy_columns
+        timestamp = row[ts_col] if ts_col is not None else float(self._lazy_timestamps[idx])
+        return timestamp, self.scale*row[xyz_cols[0]], self.scale*row[xyz_cols[1]], self.scale*row[xyz_cols[2]]
+    
+    # lazy loading: parse all the sample timestamps and positions at once (only their columns are kept)
+    def loadLazySamples(self):
+        ts_col, xyz_cols = self._lazy_columns
+        if ts_col is None:
+            xyz = np.loadtxt(self._lazy_filename, dtype=np.float64, usecols=xyz_cols, skiprows=self._lazy_skiprows, ndmin=2)
+            self.setSamples(self._lazy_timestamps, xyz)
+        else:
+            data = np.loadtxt(self._lazy_filename, dtype=np.float64, usecols=(ts_col,)+xyz_cols, skiprows=self._lazy_skiprows, ndmin=2)
+            self.setSamples(data[:,0], data[:,1:4])
+            
+    # return the timestamps of all the samples (with lazy loading, only the timestamp column is parsed) 
+    def getSampleTimestamps(self):
+        if self._ts is None and self._line_offsets is not None:
+            ts_col, _ = self._lazy_columns
+            if ts_col is None:
+                return np.asarray(self._lazy_timestamps, dtype=np.float64)
+            return np.loadtxt(self._lazy_filename, dtype=np.float64, usecols=ts_col, skiprows=self._lazy_skiprows, ndmin=1)
+        return self._ts
+            
+    # set the sample arrays from the timestamps and the (unscaled) positions; with scale 1, float64 inputs are 
+    # kept as views (no copy), so a memory-mapped data array is only read where it is accessed 
+    def setSamples(self, timestamps, xyz):
+        self._ts = np.asarray(timestamps, dtype=np.float64)
+        xyz = np.asarray(xyz, dtype=np.float64)
+        self._xyz = xyz if self.scale == 1 else self.scale*xyz
+        
+    # build the dense index map frame_id -> sample index from the associated pairs (frame_ids[i], sample_ids[i])
+    def setAssociations(self, frame_ids, sample_ids):
+        frame_ids = np.asarray(frame_ids, dtype=np.int64)
+        num_frames = int(frame_ids.max()) + 1 if len(frame_ids) > 0 else 0
+        self._assoc_idx = np.full(num_frames, -1, dtype=np.int64)
+        self._assoc_idx[frame_ids] = sample_ids
+        
+    # load the frame -> sample associations from associations_file (.npz); if this is missing, get the association matches 
+    # (map frame_id -> (sample index, diff_stamps, ...)) from the legacy json file with the same name or from compute_matches(), and save them 
+    def loadAssociations(self, associations_file, compute_matches):
+        if os.path.exists(associations_file):
+            with np.load(associations_file) as data:
+                self.setAssociations(data['frame_ids'], data['sample_ids'])
+            return
+        json_associations_file = os.path.splitext(associations_file)[0] + '.json'
+        if os.path.exists(json_associations_file):
+            with open(json_associations_file, 'rb') as f:
+                data = orjson.loads(f.read()) if kOrjsonAvailable else json.load(f)
+            matches = {int(k): v for k, v in data.items()}
+        else:
+            Printer.orange('Computing groundtruth associations (one-time operation)...')
+            matches = compute_matches()
+        frame_ids = np.fromiter(matches.keys(), dtype=np.int64, count=len(matches))
+        values = list(matches.values())
+        arrays = dict(frame_ids=frame_ids, 
+                      sample_ids=np.array([v[0] for v in values], dtype=np.int64), 
+                      diffs=np.array([v[1] for v in values], dtype=np.float64))
+        if len(values) > 0 and len(values[0]) >= 4:
+            arrays['first_timestamps'] = np.array([v[2] for v in values], dtype=np.float64)
+            arrays['second_timestamps'] = np.array([v[3] for v in values], dtype=np.float64)
+        # save associations (the dataset folder may be read-only: the matches are then recomputed or read again at the next run)
+        try:
+            np.savez(associations_file, **arrays)
+        except OSError as e:
+            Printer.orange(f'WARNING: cannot save groundtruth associations {associations_file}: {e}')
+        self.setAssociations(arrays['frame_ids'], arrays['sample_ids'])
+        
     def getDataLine(self, frame_id):
         frame_id+=self.start_frame_id
-        return self.data[frame_id].strip().split()
+        if self.data is None and self._line_offsets is not None:
+            return np.array(self._readRow(frame_id))
+        return self.data[frame_id]
+    
+    # return the sample index corresponding to each input frame id, -1 if not available (batched lookups)
+    def getPoseIndices(self, frame_ids):
+        frame_ids = np.asarray(frame_ids, dtype=np.int64)
+        if self._assoc_idx is None:
+            return np.where((frame_ids >= 0) & (frame_ids < self.getNumSamples()), frame_ids, -1)
+        valid = (frame_ids >= 0) & (frame_ids < len(self._assoc_idx))
+        return np.where(valid, self._assoc_idx[np.where(valid, frame_ids, 0)], -1)
+ 
+    # return timestamp,x,y,z of the input frame id (start frame id included), None if not available 
+    def _getTimePose(self, frame_id):
+        # scalar version of getPoseIndices(): a single frame is not worth the array round trip 
+        if self._assoc_idx is None:
+            idx = frame_id if 0 <= frame_id < self.getNumSamples() else -1
+        else:
+            idx = int(self._assoc_idx[frame_id]) if 0 <= frame_id < len(self._assoc_idx) else -1
+        if idx < 0:
+            return None
+        if self._ts is None:
+            return self._readSample(idx)   # lazy loading 
+        x, y, z = self._xyz[idx].tolist()
+        return float(self._ts[idx]),x,y,z
  
     # return timestamp,x,y,z,scale
     def getTimePoseAndAbsoluteScale(self, frame_id):
         frame_id+=self.start_frame_id
-        return 1,0,0,0,1
+        if self._ts is None and self._line_offsets is None:
+            return 1,0,0,0,1
+        pose = self._getTimePose(frame_id)
+        if pose is None:
+            raise IndexError(f'groundtruth not available for frame {frame_id}')
+        pose_prev = self._getTimePose(frame_id-1)
+        if pose_prev is None:
+            pose_prev = pose # first sample (e.g. frame 0): there is no previous pose, hence abs_scale = 0 
+        timestamp, x, y, z = pose
+        _, x_prev, y_prev, z_prev = pose_prev
+        dx, dy, dz = x - x_prev, y - y_prev, z - z_prev
+        abs_scale = math.sqrt(dx*dx + dy*dy + dz*dz)    # plain floats: math.sqrt avoids the numpy scalar overhead 
+        return timestamp,x,y,z,abs_scale 
 
     # convert the dataset into 'Simple' format  [x,y,z,scale]
     def convertToSimpleXYZ(self, filename='groundtruth.txt'):
-        out_file = open(filename,"w")
-        num_lines = len(self.data)
-        for ii in range(num_lines):
-            timestamp,x,y,z,scale = self.getTimePoseAndAbsoluteScale(ii)
-            if ii == 0:
-                scale = 1 # first sample: we do not have a relative 
-            out_file.write( "%f %f %f %f %f\n" % (timestamp,x,y,z,scale) )
-        out_file.close()
+        if self._ts is None and self._line_offsets is not None:
+            self.loadLazySamples()
+        num_lines = self.getNumSamples()
+        frame_ids = np.arange(num_lines, dtype=np.int64) + self.start_frame_id
+        idxs = self.getPoseIndices(frame_ids)
+        if np.any(idxs < 0):
+            raise IndexError(f'groundtruth not available for frame {frame_ids[np.argmax(idxs < 0)]}')
+        idxs_prev = self.getPoseIndices(frame_ids-1)
+        idxs_prev = np.where(idxs_prev >= 0, idxs_prev, idxs)
+        # fill a preallocated [timestamp,x,y,z,scale] array and write it at once 
+        out = np.empty((num_lines,5), dtype=np.float64)
+        out[:,0] = self._ts[idxs]
+        out[:,1:4] = self._xyz[idxs]
+        out[:,4] = np.linalg.norm(self._xyz[idxs] - self._xyz[idxs_prev], axis=1)
+        out[:1,4] = 1 # first sample: we do not have a relative 
+        np.savetxt(filename, out, fmt='%f')
 
     def getNumSamples(self): 
+        if self._line_offsets is not None:
+            return len(self._line_offsets)
         num_lines = len(self.data)
         return num_lines
     
     def getClosestTimestamp(self, timestamp): 
         if self.timestamps is None:
             self.getFull3dTrajectory() 
-        return self.timestamps[np.argmin(np.abs(self.timestamps - timestamp))]
+        if not self._timestamps_are_sorted:
+            return self.timestamps[np.argmin(np.abs(self.timestamps - timestamp))]
+        # binary search: only the two neighbors of the insertion point need to be compared
+        i = np.searchsorted(self.timestamps, timestamp)
+        if i == 0:
+            return self.timestamps[0]
+        if i == len(self.timestamps):
+            return self.timestamps[-1]
+        a, b = self.timestamps[i-1], self.timestamps[i]
+        return a if timestamp - a <= b - timestamp else b
 
     def getFull3dTrajectory(self):
-        num_lines = len(self.data)
-        self.trajectory = []
-        self.timestamps = []
-        for ii in range(1,num_lines-1):
-            try: 
-                timestamp,x,y,z,scale = self.getTimePoseAndAbsoluteScale(ii)
-                #print(f'timestamp: {timestamp}, x: {x}, y: {y}, z: {z}, scale: {scale}')
-                self.timestamps.append(timestamp)
-                self.trajectory.append([x,y,z])
-            except:
-                pass
-        self.timestamps = np.array(self.timestamps, dtype=np.float64)
-        self.trajectory = np.array(self.trajectory, dtype=np.float32)
+        if self._ts is None and self._line_offsets is not None:
+            self.loadLazySamples()
+        # validate once up front instead of guarding each frame 
+        if self._ts is None or self.getNumSamples() <= 2:
+            self.timestamps = np.empty(0, dtype=np.float64)
+            self.trajectory = np.empty((0,3), dtype=np.float32)
+            self.scales = np.empty(0, dtype=np.float64)
+            self._timestamps_are_sorted = True
+            return self.trajectory, self.timestamps
+        num_lines = self.getNumSamples()
+        # vectorized over all the frames: a frame is kept only if its pose and the previous one are available  
+        frame_ids = np.arange(1, num_lines-1, dtype=np.int64) + self.start_frame_id
+        idxs_prev = self.getPoseIndices(frame_ids-1)
+        idxs = self.getPoseIndices(frame_ids)
+        valid = (idxs_prev >= 0) & (idxs >= 0)
+        idxs_prev, idxs = idxs_prev[valid], idxs[valid]
+        # drop the malformed samples (e.g. nan/inf values in the groundtruth file) with a boolean mask 
+        finite = np.isfinite(self._ts) & np.all(np.isfinite(self._xyz), axis=1)
+        valid = finite[idxs] & finite[idxs_prev]
+        idxs_prev, idxs = idxs_prev[valid], idxs[valid]
+        xyz = self._xyz[idxs]
+        self.timestamps = self._ts[idxs]
+        self._timestamps_are_sorted = bool(np.all(self.timestamps[1:] >= self.timestamps[:-1]))
+        self.trajectory = xyz.astype(np.float32)
+        self.scales = np.linalg.norm(xyz - self._xyz[idxs_prev], axis=1)
         return self.trajectory, self.timestamps
         
 
 # read the ground truth from a simple file containining [x,y,z,scale,timestamp] lines
 class SimpleGroundTruth(GroundTruth):
-    def __init__(self, path, name, associations=None, start_frame_id=0, type = GroundTruthType.KITTI): 
-        super().__init__(path, name, associations, start_frame_id, type)
+    def __init__(self, path, name, associations=None, start_frame_id=0, type = GroundTruthType.KITTI, lazy=False): 
+        super().__init__(path, name, associations, start_frame_id, type, lazy)
         self.scale = kScaleSimple
         self.filename=path + '/' + name
-        with open(self.filename) as f:
-            self.data = f.readlines()
+        if self.lazy:
+            self.openLazy(self.filename, xyz_cols=(1,2,3), ts_col=0)
             self.found = True 
+            return 
+        self.data = np.loadtxt(self.filename, dtype=np.float64, ndmin=2)   # rows [timestamp,x,y,z,scale]
+        self.found = True 
         if self.data is None:
             sys.exit('ERROR while reading groundtruth file: please, check how you deployed the files and if the code is consistent with this!') 
-
-    # return timestamp,x,y,z,scale
-    def getTimePoseAndAbsoluteScale(self, frame_id):
-        frame_id+=self.start_frame_id
-        ss = self.getDataLine(frame_id-1)
-        x_prev = self.scale*float(ss[1])
-        y_prev = self.scale*float(ss[2])
-        z_prev = self.scale*float(ss[3])     
-        ss = self.getDataLine(frame_id)
-        timestamp = float(ss[0]) 
-        x = self.scale*float(ss[1])
-        y = self.scale*float(ss[2])
-        z = self.scale*float(ss[3])
-        abs_scale = np.sqrt((x - x_prev)*(x - x_prev) + (y - y_prev)*(y - y_prev) + (z - z_prev)*(z - z_prev))
-        return timestamp,x,y,z,abs_scale 
+        self.setSamples(self.data[:,0], self.data[:,1:4])
 
 
 class KittiGroundTruth(GroundTruth):
-    def __init__(self, path, name, associations=None, start_frame_id=0, type = GroundTruthType.KITTI): 
-        super().__init__(path, name, associations, start_frame_id, type)
+    def __init__(self, path, name, associations=None, start_frame_id=0, type = GroundTruthType.KITTI, lazy=False): 
+        super().__init__(path, name, associations, start_frame_id, type, lazy)
         self.scale = kScaleKitti
         self.filename=path + '/poses/' + name + '.txt'   # N.B.: this may depend on how you deployed the groundtruth files 
         self.filename_timestamps = path + '/sequences/' + name + '/times.txt'
-        with open(self.filename) as f:
-            self.data = f.readlines()
-            self.found = True 
-        if self.data is None:
-            sys.exit('ERROR while reading groundtruth file: please, check how you deployed the files and if the code is consistent with this!') 
-        self.data_timestamps = None
-        with open(self.filename_timestamps) as f:
-            self.data_timestamps = f.readlines()
+        # N.B.: the files only contain whitespace-separated floats, hence they are parsed in bulk from their bytes 
+        with open(self.filename_timestamps, 'rb') as f:
+            self.data_timestamps = np.fromstring(f.read(), dtype=np.float64, sep=' ')
             self.found = True 
         if self.data_timestamps is None:
             sys.exit('ERROR while reading groundtruth file: please, check how you deployed the files and if the code is consistent with this!')             
-
-
-    # return timestamp,x,y,z,scale
-    def getTimePoseAndAbsoluteScale(self, frame_id):
-        frame_id+=self.start_frame_id
-        ss = self.getDataLine(frame_id-1)
-        x_prev = self.scale*float(ss[3])
-        y_prev = self.scale*float(ss[7])
-        z_prev = self.scale*float(ss[11])     
-        ss = self.getDataLine(frame_id) 
-        x = self.scale*float(ss[3])
-        y = self.scale*float(ss[7])
-        z = self.scale*float(ss[11])
-        abs_scale = np.sqrt((x - x_prev)*(x - x_prev) + (y - y_prev)*(y - y_prev) + (z - z_prev)*(z - z_prev))
-
-        timestamp = float(self.data_timestamps[frame_id].strip())
-            
-        return timestamp,x,y,z,abs_scale 
+        # each KITTI pose is a row-major 3x4 matrix [R|t]: the position is in the columns (3,7,11)
+        if self.lazy:
+            self.openLazy(self.filename, xyz_cols=(3,7,11), ts_col=None, timestamps=self.data_timestamps)
+            return 
+        with open(self.filename, 'rb') as f:
+            self.data = np.fromstring(f.read(), dtype=np.float64, sep=' ')
+            self.found = True 
+        if self.data is None or self.data.size % 12 != 0:
+            sys.exit('ERROR while reading groundtruth file: please, check how you deployed the files and if the code is consistent with this!') 
+        self.data = self.data.reshape(-1,12)
+        self.setSamples(self.data_timestamps, self.data[:,(3,7,11)])
 
 
 class TumGroundTruth(GroundTruth):
-    def __init__(self, path, name, associations=None, start_frame_id=0, type = GroundTruthType.TUM): 
-        super().__init__(path, name, associations, start_frame_id, type)
+    def __init__(self, path, name, associations=None, start_frame_id=0, type = GroundTruthType.TUM, lazy=False): 
+        super().__init__(path, name, associations, start_frame_id, type, lazy)
         self.scale = kScaleTum 
         self.filename=path + '/' + name + '/' + 'groundtruth.txt'     # N.B.: this may depend on how you deployed the groundtruth files 
         self.file_associations=path + '/' + name + '/' + associations # N.B.: this may depend on how you name the associations file
@@ -209,49 +519,27 @@ class TumGroundTruth(GroundTruth):
         base_path = os.path.dirname(self.filename)
         print('base_path: ', base_path)
                 
-        with open(self.filename) as f:
-            self.data = f.readlines()[3:] # skip the first three rows, which are only comments 
-            self.data = [line.strip().split() for line in  self.data] 
-        if self.data is None:
-            sys.exit('ERROR while reading groundtruth file!') 
+        # rows [timestamp,tx,ty,tz,qx,qy,qz,qw]; skip the first three rows, which are only comments 
+        if self.lazy:
+            self.openLazy(self.filename, xyz_cols=(1,2,3), ts_col=0, skiprows=3)
+        else: 
+            self.data = self.loadData(self.filename, base_path + '/gt_data.npy', skiprows=3) 
+            if self.data is None:
+                sys.exit('ERROR while reading groundtruth file!') 
+            self.setSamples(self.data[:,0], self.data[:,1:4])
         if self.file_associations is not None: 
-            with open(self.file_associations) as f:
-                self.associations = f.readlines()
-                self.associations = [line.strip().split() for line in self.associations] 
+            # each line is 'rgb_timestamp rgb_file depth_timestamp depth_file': only the rgb timestamps are needed
+            self.associations = np.loadtxt(self.file_associations, dtype=np.float64, usecols=0, ndmin=1)
             if self.associations is None:
                 sys.exit('ERROR while reading associations file!')   
                 
-        associations_file = base_path + '/gt_associations.json'
-        if not os.path.exists(associations_file):
-            Printer.orange('Computing groundtruth associations (one-time operation)...')             
-            self.association_matches = self.associate(self.associations, self.data)
-            # save associations
-            with open(associations_file, 'w') as f:
-                json.dump(self.association_matches, f)
-        else: 
-            with open(associations_file, 'r') as f:
-                data = json.load(f)
-                self.association_matches = {int(k): v for k, v in data.items()}
+        associations_file = base_path + '/gt_associations.npz'
+        self.loadAssociations(associations_file, lambda: self.associate(self.associations, self.getSampleTimestamps()))
 
     def getDataLine(self, frame_id):
-        #return self.data[self.association_matches[frame_id][1]]
-        return self.data[self.association_matches[frame_id][0]]
-
-    # return timestamp,x,y,z,scale
-    def getTimePoseAndAbsoluteScale(self, frame_id):
-        frame_id+=self.start_frame_id
-        ss = self.getDataLine(frame_id-1) 
-        x_prev = self.scale*float(ss[1])
-        y_prev = self.scale*float(ss[2])
-        z_prev = self.scale*float(ss[3])     
-        ss = self.getDataLine(frame_id)
-        timestamp = float(ss[0]) 
-        x = self.scale*float(ss[1])
-        y = self.scale*float(ss[2])
-        z = self.scale*float(ss[3])
-        abs_scale = np.sqrt((x - x_prev)*(x - x_prev) + (y - y_prev)*(y - y_prev) + (z - z_prev)*(z - z_prev))
-        return timestamp,x,y,z,abs_scale 
-        #return timestamp,-x,-y,-z,abs_scale
+        if self.data is None:
+            return np.array(self._readRow(self._assoc_idx[frame_id]))   # lazy loading
+        return self.data[self._assoc_idx[frame_id]]
     
     @staticmethod
     def associate(first_list, second_list, offset=0, max_difference=0.025*(10**9)):
@@ -260,8 +548,8 @@ class TumGroundTruth(GroundTruth):
         to find the closest match for every input tuple.
         
         Input:
-        first_list -- first list of (stamp,data) tuples
-        second_list -- second list of (stamp,data) tuples
+        first_list -- first list of (stamp,data) tuples (or array of stamps, or array whose first column contains the stamps)
+        second_list -- second list of (stamp,data) tuples (or array of stamps, or array whose first column contains the stamps)
         offset -- time offset between both dictionaries (e.g., to model the delay between the sensors)
         max_difference -- search radius for candidate generation
 
@@ -269,31 +557,21 @@ class TumGroundTruth(GroundTruth):
         matches -- map: index_stamp_first -> (index_stamp_second, diff_stamps, first_timestamp, second_timestamp)
         
         """
-        potential_matches = [(abs(float(a[0]) - (float(b[0]) + offset)), ia, ib) # a[0] and b[0] extract the first element which is a timestamp 
-                            for ia,a in enumerate(first_list)      #for counter, value in enumerate(some_list)
-                            for ib,b in enumerate(second_list)
-                            if abs(float(a[0])  - (float(b[0])  + offset)) < max_difference]
-        potential_matches.sort()
+        first_ts = get_timestamps(first_list)
+        second_ts = get_timestamps(second_list)
+        ias, ibs, diffs = associate_nearest(first_ts, second_ts, offset, max_difference)
+        # convert the matched timestamps to floats at once, not per match 
+        first_stamps = first_ts[ias].tolist()
+        second_stamps = second_ts[ibs].tolist()
         matches = {}
-        first_flag = [False]*len(first_list)
-        second_flag = [False]*len(second_list)
-        for diff, ia, ib in potential_matches:
-            if first_flag[ia] is False and second_flag[ib] is False:
-                #first_list.remove(a)
-                first_flag[ia] = True
-                #second_list.remove(b)
-                second_flag[ib] = True 
-                matches[ia]= (ib, diff, first_list[ia][0], second_list[ib][0])
-        missing_associations = [(ia,a) for ia,a in enumerate(first_list) if first_flag[ia] is False]
-        num_missing_associations = len(missing_associations)
-        if num_missing_associations > 0:
-            Printer.red(f'ERROR: {num_missing_associations} missing associations!')
+        for ia, ib, diff, first_stamp, second_stamp in zip(ias.tolist(), ibs.tolist(), diffs.tolist(), first_stamps, second_stamps):
+            matches[ia]= (ib, diff, first_stamp, second_stamp)
         return matches       
 
 
 class EurocGroundTruth(GroundTruth):
-    def __init__(self, path, name, associations=None, start_frame_id=0, type = GroundTruthType.EUROC): 
-        super().__init__(path, name, associations, start_frame_id, type)
+    def __init__(self, path, name, associations=None, start_frame_id=0, type = GroundTruthType.EUROC, lazy=False): 
+        super().__init__(path, name, associations, start_frame_id, type, lazy)
         self.scale = kScaleEuroc
         self.filename = path + '/' + name + '/mav0/state_groundtruth_estimate0/data.tum'   # N.B.: Use the script groundtruth/generate_euroc_groundtruths_as_tum.sh to generate these groundtruth files
         
@@ -303,61 +581,48 @@ class EurocGroundTruth(GroundTruth):
         if not os.path.isfile(self.filename):
             Printer.red(f'Groundtruth file not found: {self.filename}')
                                     
-        with open(self.filename) as f:
-            self.data = f.readlines()
-            self.data = [line.strip().split() for line in self.data] 
+        if self.lazy:
+            self.openLazy(self.filename, xyz_cols=(1,2,3), ts_col=0)
+        else: 
+            self.data = self.loadData(self.filename, base_path + '/gt_data.npy')
+        # from https://www.researchgate.net/profile/Michael-Burri/publication/291954561_The_EuRoC_micro_aerial_vehicle_datasets/links/56af0c6008ae19a38516937c/The-EuRoC-micro-aerial-vehicle-datasets.pdf
+        # WIP - not sure this is correct: [timestamp,y,z,-x]
                     
-        if len(self.data) > 0:
+        if self.getNumSamples() > 0:
             self.found = True
-            print('Processing Euroc groundtruth of lenght: ', len(self.data))
+            print('Processing Euroc groundtruth of lenght: ', self.getNumSamples())
+            if not self.lazy:
+                self.setSamples(self.data[:,0], self.data[:,1:4])
                 
-        if len(self.data) == 0:
+        if self.getNumSamples() == 0:
             sys.exit(f'ERROR while reading groundtruth file {self.filename}: please, check how you deployed the files and if the code is consistent with this!') 
                     
         self.image_left_csv_path = path + '/' + name + '/mav0/cam0/data.csv'
-        self.image_data=self.read_image_data(self.image_left_csv_path)
+        self.image_timestamps, self.image_filenames = self.read_image_data(self.image_left_csv_path)
                             
-        associations_file = base_path + '/associations.json'
-        if not os.path.exists(associations_file):
-            Printer.orange('Computing groundtruth associations (one-time operation)...')             
-            self.association_matches = self.associate(self.image_data, self.data)
-            # save associations
-            with open(associations_file, 'w') as f:
-                json.dump(self.association_matches, f)
-        else: 
-            with open(associations_file, 'r') as f:
-                data = json.load(f)
-                self.association_matches = {int(k): v for k, v in data.items()}
+        associations_file = base_path + '/associations.npz'
+        self.loadAssociations(associations_file, lambda: self.associate(self.image_timestamps, self.getSampleTimestamps()))
 
+    # return the arrays timestamps_s [N], xyz [Nx3]
     def read_gt_data(self, csv_file):
-        data = []
         # check csv_file exists 
         if not os.path.isfile(csv_file):
             Printer.red(f'Groundtruth file not found: {csv_file}')
-            return []
-        with open(csv_file, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader)  # Skip header row
-            for row in reader:
-                timestamp_ns = int(row[0])
-                x = row[1]
-                y = row[2]
-                z = row[3]
-                timestamp_s = (timestamp_ns / 1000000000)
-                data.append((timestamp_s, (x,y,z)))
-        return data
+            return np.empty(0, dtype=np.float64), np.empty((0,3), dtype=np.float64)
+        # skip header row; parse the file once: the structured dtype keeps the int64 timestamps exact 
+        data = np.loadtxt(csv_file, delimiter=',', skiprows=1, usecols=(0,1,2,3), ndmin=1,
+                          dtype=[('timestamp', np.int64), ('xyz', np.float64, (3,))])
+        timestamps_s = data['timestamp'] / 1000000000
+        return timestamps_s, np.ascontiguousarray(data['xyz'])
     
+    # return the arrays timestamps_s [N], filenames [N]
     def read_image_data(self, csv_file):
-        timestamps_and_filenames = []
-        with open(csv_file, 'r') as f:
-            reader = csv.reader(f)
-            header = next(reader)  # Skip header row
-            for row in reader:
-                timestamp_ns = int(row[0])
-                filename = row[1]
-                timestamp_s = (timestamp_ns / 1000000000)
-                timestamps_and_filenames.append((timestamp_s, filename))
-        return timestamps_and_filenames    
+        # skip header row; parse the file once as strings and convert the timestamps column to int64 
+        data = np.loadtxt(csv_file, delimiter=',', skiprows=1, usecols=(0,1), dtype=str, ndmin=2)
+        timestamps_ns = data[:,0].astype(np.int64)
+        filenames = data[:,1]
+        timestamps_s = timestamps_ns / 1000000000
+        return timestamps_s, filenames    
     
     @staticmethod
     def associate(first_list, second_list, offset=0, max_difference=0.025*(10**9)):
@@ -366,8 +631,8 @@ class EurocGroundTruth(GroundTruth):
         to find the closest match for every input tuple.
         
         Input:
-        first_list -- first list of (stamp,data) tuples
-        second_list -- second list of (stamp,data) tuples
+        first_list -- first list of (stamp,data) tuples (or array of stamps, or array whose first column contains the stamps)
+        second_list -- second list of (stamp,data) tuples (or array of stamps, or array whose first column contains the stamps)
         offset -- time offset between both dictionaries (e.g., to model the delay between the sensors)
         max_difference -- search radius for candidate generation
 
@@ -375,46 +640,13 @@ class EurocGroundTruth(GroundTruth):
         matches -- map index_stamp_first -> (index_stamp_second, diff_stamps)
         
         """
-        potential_matches = [(abs(float(a[0]) - (float(b[0]) + offset)), ia, ib) # a[0] and b[0] extract the first element which is a timestamp 
-                            for ia,a in enumerate(first_list)      #for counter, value in enumerate(some_list)
-                            for ib,b in enumerate(second_list)
-                            if abs(float(a[0])  - (float(b[0])  + offset)) < max_difference]
-        potential_matches.sort()
+        ias, ibs, diffs = associate_nearest(get_timestamps(first_list), get_timestamps(second_list), offset, max_difference)
         matches = {}
-        first_flag = [False]*len(first_list)
-        second_flag = [False]*len(second_list)
-        for diff, ia, ib in potential_matches:
-            if first_flag[ia] is False and second_flag[ib] is False:
-                #first_list.remove(a)
-                first_flag[ia] = True
-                #second_list.remove(b)
-                second_flag[ib] = True 
-                matches[ia]= (ib, diff)
-        missing_associations = [(ia,a) for ia,a in enumerate(first_list) if first_flag[ia] is False]
-        num_missing_associations = len(missing_associations)
-        if num_missing_associations > 0:
-            Printer.red(f'ERROR: {num_missing_associations} missing associations!')
+        for ia, ib, diff in zip(ias.tolist(), ibs.tolist(), diffs.tolist()):
+            matches[ia]= (ib, diff)
         return matches   
         
     def getDataLine(self, frame_id):
-        return self.data[self.association_matches[frame_id][0]]
-    
-    def getTimePoseAndAbsoluteScale(self, frame_id):
-        frame_id+=self.start_frame_id
-        ss = self.getDataLine(frame_id-1) 
-        #print(f'ss[{frame_id-1}]: {ss}')
-        x_prev = self.scale*float(ss[1])
-        y_prev = self.scale*float(ss[2])
-        z_prev = self.scale*float(ss[3])     
-        ss = self.getDataLine(frame_id) 
-        #print(f'ss[{frame_id}]: {ss}')  
-        timestamp = float(ss[0])      
-        x = self.scale*float(ss[1])
-        y = self.scale*float(ss[2])
-        z = self.scale*float(ss[3])
-        abs_scale = np.sqrt((x - x_prev)*(x - x_prev) + (y - y_prev)*(y - y_prev) + (z - z_prev)*(z - z_prev))
-        #print(f'abs_scale: {abs_scale}')
-        # from https://www.researchgate.net/profile/Michael-Burri/publication/291954561_The_EuRoC_micro_aerial_vehicle_datasets/links/56af0c6008ae19a38516937c/The-EuRoC-micro-aerial-vehicle-datasets.pdf
-        # WIP - not sure this is correct
-        #return timestamp, y,z,-x, abs_scale   
-        return timestamp, x,y,z, abs_scale
\ No newline at end of file
+        if self.data is None:
+            return np.array(self._readRow(self._assoc_idx[frame_id]))   # lazy loading
+        return self.data[self._assoc_idx[frame_id]]
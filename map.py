@@ -44,6 +44,11 @@ import optimizer_g2o
 kVerbose = True 
 kMaxLenFrameDeque = 20
 
+kChi2Mono = Parameters.kChi2Mono      # used in the loops over points and keyframes 
+kChi2Stereo = Parameters.kChi2Stereo
+kNumBestCovisibilityKeyFrames = Parameters.kNumBestCovisibilityKeyFrames
+kMaxNumOfKeyframesInLocalMap = Parameters.kMaxNumOfKeyframesInLocalMap
+
 
 if not kVerbose:
     def print(*args, **kwargs):
@@ -278,9 +283,9 @@ class Map(object):
                     errs1_stereo = np.where(is_stereo1[:, np.newaxis], errs1_stereo_vec, np.zeros(3)) 
                     errs1_stereo_sqr = np.sum(errs1_stereo * errs1_stereo, axis=1)  # squared reprojection errors    
                     chis2_1_stereo = errs1_stereo_sqr * invSigmas2_1         # chi square            
-                    bad_chis2_1 = np.logical_or(chis2_1_mono > Parameters.kChi2Mono, chis2_1_stereo > Parameters.kChi2Stereo)                                                  
+                    bad_chis2_1 = np.logical_or(chis2_1_mono > kChi2Mono, chis2_1_stereo > kChi2Stereo)                                                  
                 else: 
-                    bad_chis2_1 = chis2_1_mono > Parameters.kChi2Mono
+                    bad_chis2_1 = chis2_1_mono > kChi2Mono
                               
                 # compute mono reproj errors on kf1                                                                 
                 errs2_mono_vec = uvs2 - kf2.kpsu[idxs2] # mono errors               
@@ -298,9 +303,9 @@ class Map(object):
                     errs2_stereo = np.where(is_stereo2[:, np.newaxis], errs2_stereo_vec, np.zeros(3)) 
                     errs2_stereo_sqr = np.sum(errs2_stereo * errs2_stereo, axis=1)  # squared reprojection errors
                     chis2_2_stereo = errs2_stereo_sqr * invSigmas2_2         # chi square
-                    bad_chis2_2 = np.logical_or(chis2_2_mono > Parameters.kChi2Mono, chis2_2_stereo > Parameters.kChi2Stereo)
+                    bad_chis2_2 = np.logical_or(chis2_2_mono > kChi2Mono, chis2_2_stereo > kChi2Stereo)
                 else: 
-                    bad_chis2_2 = chis2_2_mono > Parameters.kChi2Mono  # chi-square 2 DOFs  (Hartley Zisserman pg 119)                      
+                    bad_chis2_2 = chis2_2_mono > kChi2Mono  # chi-square 2 DOFs  (Hartley Zisserman pg 119)                      
                 
                 # scale consistency check
                 ratio_scale_consistency = Parameters.kScaleConsistencyFactor * Frame.feature_manager.scale_factor 
@@ -493,7 +498,7 @@ class Map(object):
                         chi2s.append(np.inner(err,err)*invSigma2)
                     # cull
                     mean_chi2 = np.mean(chi2s)
-                    if np.mean(chi2s) > Parameters.kChi2Mono:  # chi-square 2 DOFs  (Hartley Zisserman pg 119)
+                    if mean_chi2 > kChi2Mono:  # chi-square 2 DOFs  (Hartley Zisserman pg 119)
                         culled_pt_count += 1
                         #print('removing point: ',p.id, 'from frames: ', [f.id for f in p.keyframes])
                         self.remove_point(p)
@@ -664,14 +669,14 @@ class LocalMapBase(object):
     
         # include also some not-already-included keyframes that are neighbors to already-included keyframes
         for kf in list(viewing_keyframes.keys()):
-            second_neighbors = kf.get_best_covisible_keyframes(Parameters.kNumBestCovisibilityKeyFrames)
+            second_neighbors = kf.get_best_covisible_keyframes(kNumBestCovisibilityKeyFrames)
             viewing_keyframes.update(second_neighbors)
             children = kf.get_children()
             viewing_keyframes.update(children)        
-            if len(viewing_keyframes) >= Parameters.kMaxNumOfKeyframesInLocalMap:
+            if len(viewing_keyframes) >= kMaxNumOfKeyframesInLocalMap:
                 break                 
         
-        local_keyframes_counts = viewing_keyframes.most_common(Parameters.kMaxNumOfKeyframesInLocalMap)           
+        local_keyframes_counts = viewing_keyframes.most_common(kMaxNumOfKeyframesInLocalMap)           
         local_points = set()
         local_keyframes = []
         for kf,c in local_keyframes_counts:
@@ -37,6 +37,8 @@ from rotation_histogram import RotationHistogram
 kMinDistanceFromEpipole = Parameters.kMinDistanceFromEpipole
 kMinDistanceFromEpipole2 = kMinDistanceFromEpipole*kMinDistanceFromEpipole
 kCheckFeaturesOrientation = Parameters.kCheckFeaturesOrientation 
+kChi2Mono = Parameters.kChi2Mono 
+kChi2Stereo = Parameters.kChi2Stereo 
 
 
 # propagate map point matches from f_ref to f_cur (access frames from tracking thread, no need to lock)
@@ -526,11 +528,11 @@ def search_and_fuse(points, keyframe,
             chi2 = np.inner(err,err)*invSigma2     
             if do_check_stereo_reproj_err and check_stereo[h]:
                 chi2 += errs_ur2[h]*invSigma2 
-                if chi2 > Parameters.kChi2Stereo: # chi-square 3 DOFs  (Hartley Zisserman pg 119)
+                if chi2 > kChi2Stereo: # chi-square 3 DOFs  (Hartley Zisserman pg 119)
                     #print('p[%d] big reproj err %f **********************************' % (i,chi2))
                     continue
             else:           
-                if chi2 > Parameters.kChi2Mono: # chi-square 2 DOFs  (Hartley Zisserman pg 119)
+                if chi2 > kChi2Mono: # chi-square 2 DOFs  (Hartley Zisserman pg 119)
                     #print('p[%d] big reproj err %f **********************************' % (i,chi2))
                     continue                  
                             